@@ -2,21 +2,183 @@
 # ---------------------------------------------------------------------------------
 # Enhanced Home/About: interactive cards, CSS, CTAs, and a simple architecture diagram.
 # Notes:
-# - Run: pip install -U streamlit pandas matplotlib
+# - Run: pip install -U streamlit numpy pandas pyarrow orjson markupsafe
 # - streamlit run app.py
 # - This file keeps demo logic for the Consumer and Doctor modules and adds an interactive, styled landing page.
 # ---------------------------------------------------------------------------------
 
+import hashlib
 import io
 import json
-from datetime import datetime, date, timedelta
-from typing import Dict, List
-
+import logging
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime, date, timedelta, timezone
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Optional
+
+import orjson
+from markupsafe import Markup, escape
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
 
 APP_TITLE = "Viatra — Consumer & Hospital Hubs"
+PAGE_NAMES = ["Home / About", "Viatra (Consumer)", "Viatra (Hospital)"]
+
+VITALS_COLUMNS = ["datetime","systolic","diastolic","hr","glucose"]
+VITALS_DTYPES = {"datetime":"datetime64[ns]","systolic":"int16","diastolic":"int16","hr":"int16","glucose":"int16"}
+PATIENT_COLUMNS = ["id","name","age","sex","allergies","comorbidities"]
+ROSTER_COLUMNS = ["date","shift","doctor"]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _fmt_ts(ts_ns: int) -> str:
+    # Timestamps are stored as epoch nanoseconds and only formatted for display.
+    return (_EPOCH + timedelta(microseconds=ts_ns // 1000)).isoformat()
+
+
+@dataclass(slots=True)
+class PilotRequest:
+    org: str
+    email: str
+    use_case: str
+    notes: str
+    created_ns: int
+
+    def row(self) -> dict:
+        return {"org": self.org, "email": self.email, "use_case": self.use_case, "notes": self.notes, "created": _fmt_ts(self.created_ns)}
+
+
+@dataclass(slots=True)
+class ChatMessage:
+    ts_ns: int
+    who: str
+    msg: str
+
+    def row(self) -> dict:
+        return {"when": _fmt_ts(self.ts_ns), "who": self.who, "msg": self.msg}
+
+
+@dataclass(slots=True)
+class RosterEntry:
+    date: str
+    shift: str
+    doctor: str
+
+
+CACHE_DIR = Path(".viatra_cache")
+_log = logging.getLogger("viatra")
+LOG_TYPES = {"chat": ChatMessage, "pilot_requests": PilotRequest}
+PERSIST_SCHEMAS = {
+    "passport": pa.schema([
+        ("profile", pa.string()),
+        ("immunizations", pa.list_(pa.string())),
+        ("allergies", pa.list_(pa.string())),
+        ("conditions", pa.list_(pa.string())),
+    ]),
+}
+
+# ----------------------------
+# Disk Persistence
+# ----------------------------
+
+def _owner_dir() -> Optional[Path]:
+    # Only signed-in users (st.login) are persisted, in a directory keyed by their subject id.
+    # Anonymous sessions keep their state in memory only.
+    sub = st.user.get("sub")
+    if not sub:
+        return None
+    return CACHE_DIR / hashlib.sha256(sub.encode()).hexdigest()[:32]
+
+
+@st.cache_resource
+def _write_lock() -> threading.Lock:
+    # Sessions share one process; cache_resource keeps a single lock across reruns,
+    # which a module-level Lock would not survive.
+    return threading.Lock()
+
+
+# Writes are best-effort: session state is updated first and stays authoritative, and a
+# failed disk write is logged rather than surfaced to the page.
+
+def _persist(key: str):
+    # Profile-keyed dicts are rewritten whole as one Parquet row per profile.
+    owner_dir = st.session_state.owner_dir
+    if owner_dir is None:
+        return
+    rows = [{"profile": name, **entry} for name, entry in st.session_state[key].items()]
+    path = owner_dir / f"{key}.parquet"
+    try:
+        with _write_lock():
+            owner_dir.mkdir(parents=True, exist_ok=True)
+            pq.write_table(pa.Table.from_pylist(rows, schema=PERSIST_SCHEMAS[key]), path)
+    except (pa.ArrowInvalid, OSError):
+        _log.warning("Could not write %s; %s is kept in memory only", path, key, exc_info=True)
+
+
+def _load_table(key: str) -> Dict[str, dict]:
+    if st.session_state.owner_dir is None:
+        return {}
+    path = st.session_state.owner_dir / f"{key}.parquet"
+    if not path.exists():
+        return {}
+    try:
+        rows = pq.read_table(path).to_pylist()
+    except (pa.ArrowInvalid, OSError):
+        _log.warning("Could not read %s; starting with empty %s", path, key, exc_info=True)
+        return {}
+    return {row.pop("profile"): row for row in rows}
+
+
+def _append_log(key: str, record):
+    # Append-only lists get one Arrow IPC stream per record appended to the file, so nothing is rewritten.
+    st.session_state[key].append(record)
+    owner_dir = st.session_state.owner_dir
+    if owner_dir is None:
+        return
+    path = owner_dir / f"{key}.arrows"
+    try:
+        batch = pa.RecordBatch.from_pylist([asdict(record)])
+        with _write_lock():
+            owner_dir.mkdir(parents=True, exist_ok=True)
+            with pa.OSFile(str(path), "ab") as sink, ipc.new_stream(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+    except (pa.ArrowInvalid, OSError):
+        _log.warning("Could not append to %s; the %s entry is kept in memory only", path, key, exc_info=True)
+
+
+def _load_log(key: str) -> list:
+    if st.session_state.owner_dir is None:
+        return []
+    path = st.session_state.owner_dir / f"{key}.arrows"
+    if not path.exists():
+        return []
+    rows = []
+    try:
+        with pa.OSFile(str(path), "rb") as source:
+            while source.tell() < source.size():
+                rows.extend(ipc.open_stream(source).read_all().to_pylist())
+    except (pa.ArrowInvalid, OSError):
+        _log.warning("Could not read %s; starting with an empty %s log", path, key, exc_info=True)
+        return []
+    records = (_log_record(key, row) for row in rows)
+    return [r for r in records if r is not None]
+
+
+def _log_record(key: str, row: dict):
+    try:
+        return LOG_TYPES[key](**row)
+    except (TypeError, ValueError):
+        _log.warning("Skipping unreadable %s row: %r", key, row)
+        return None
 
 # ----------------------------
 # Session State Bootstrapping
@@ -26,43 +188,141 @@ def _init_state():
     ss = st.session_state
     ss.setdefault("active_profile", "Me")
     ss.setdefault("profiles", {"Me": {"dob": None, "gender": None}})
-    ss.setdefault("vitals", {"Me": pd.DataFrame(columns=["datetime","systolic","diastolic","hr","glucose"])})
+    ss.setdefault("profile_names", tuple(ss.profiles))
+    ss.setdefault("vitals_rows", {"Me": []})
     ss.setdefault("meds", {"Me": []})
     ss.setdefault("records", {"Me": []})
     ss.setdefault("lab_text", "")
     ss.setdefault("challenges", {"Me": {"name": None, "progress": 0, "started": None}})
-    ss.setdefault("roster", pd.DataFrame(columns=["date","shift","doctor"]))
-    ss.setdefault("patients", pd.DataFrame(columns=["id","name","age","sex","allergies","comorbidities"]))
-    ss.setdefault("notes", pd.DataFrame(columns=["patient_id","timestamp","author","note"]))
-    ss.setdefault("chat", [])
-    ss.setdefault("passport", {"Me": {"immunizations": [], "allergies": [], "conditions": []}})
+    ss.setdefault("roster_rows", [])
+    ss.setdefault("patient_rows", [])
+    ss.setdefault("patient_edits", 0)
     ss.setdefault("micro_consults", [])
-    ss.setdefault("pilot_requests", [])
+    # Persisted state is hydrated from disk once per session, not on every rerun.
+    if "owner_dir" not in ss:
+        ss.owner_dir = _owner_dir()
+    if "passport" not in ss:
+        ss.passport = {"Me": {"immunizations": [], "allergies": [], "conditions": []}, **_load_table("passport")}
+    if "chat" not in ss:
+        ss.chat = _load_log("chat")
+    if "pilot_requests" not in ss:
+        ss.pilot_requests = _load_log("pilot_requests")
+    ss.setdefault("frame_cache", {})
 
 _init_state()
 
+
+def _frame(name: str, rows: list, columns: List[str] = None, dtypes: Dict[str, str] = None, version: int = 0, to_row=None, sort_by: List[str] = None) -> pd.DataFrame:
+    # Rows are appended as plain dicts or dataclasses; the DataFrame is only rebuilt when
+    # the row count or the caller's edit counter changes.
+    cache = st.session_state.frame_cache
+    hit = cache.get(name)
+    if hit is None or hit[0] != (len(rows), version):
+        to_row = to_row or (lambda r: asdict(r) if is_dataclass(r) else r)
+        df = pd.DataFrame([to_row(r) for r in rows], columns=columns)
+        if dtypes:
+            df = df.astype(dtypes)
+        if sort_by:
+            df = df.sort_values(by=sort_by)
+        hit = ((len(rows), version), df)
+        cache[name] = hit
+    return hit[1]
+
 # ----------------------------
 # CSS & UI Helpers
 # ----------------------------
 
-CUSTOM_CSS = """
+_split_csv = re.compile(r"\s*,\s*").split
+
+
+def _csv(s: str) -> List[str]:
+    return [t for t in _split_csv(s.strip()) if t]
+
+
+_STYLES = """
 <style>
 :root{--card-bg:#ffffff;--muted:#6b7280;--accent:#0f62fe;--glass:rgba(255,255,255,0.06)}
 .app-header{display:flex;align-items:center;justify-content:space-between;padding:18px;border-bottom:1px solid #e6eef8}
 .brand{font-weight:700;font-size:20px}
 .lead{color:var(--muted);margin-top:6px}
 .card-grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(260px,1fr));gap:18px;margin-top:18px}
-.card{background:linear-gradient(180deg, rgba(255,255,255,0.98), rgba(250,250,250,0.98));border-radius:12px;padding:18px;box-shadow:0 6px 20px rgba(15,23,42,0.06);border:1px solid #eef3ff}
-.card h4{margin:0 0 6px 0}
-.small{font-size:13px;color:var(--muted)}
-.kpi{font-size:18px;font-weight:700}
 .cta{background:var(--accent);color:white;padding:10px 14px;border-radius:10px;text-decoration:none}
-.feature-list{margin:0;padding-left:18px}
 .pill{display:inline-block;padding:6px 10px;border-radius:999px;background:#f1f5ff;color:#0b4bd6;font-weight:600;font-size:12px;margin-right:8px}
 .footer-small{color:var(--muted);font-size:12px;margin-top:22px}
+.card {
+    background: #1E1E1E;
+    border: 1px solid #eef3ff;
+    border-radius: 16px;
+    padding: 20px;
+    margin-bottom: 20px;
+    box-shadow: 0px 2px 10px rgba(0,0,0,0.3);
+    transition: transform 0.2s ease, box-shadow 0.2s ease;
+}
+.card:hover {
+    transform: translateY(-5px);
+    box-shadow: 0px 6px 18px rgba(0,0,0,0.45);
+}
+.card h4 {
+    margin: 0 0 10px 0;
+    font-size: 1.3rem;
+    font-weight: 600;
+    color: #ffffff;
+}
+.kpi {
+    font-size: 1.1rem;
+    font-weight: bold;
+    color: #00d4ff;
+    margin-bottom: 10px;
+}
+.small {
+    font-size: 0.95rem;
+    color: #d0d0d0;
+    margin-bottom: 10px;
+    line-height: 1.5;
+}
+.feature-list {
+    list-style: none;
+    padding-left: 0;
+    margin: 0 0 15px 0;
+}
+.feature-list li {
+    position: relative;
+    padding-left: 25px;
+    margin-bottom: 8px;
+    color: #ededed;
+    font-size: 0.95rem;
+}
+.feature-list li::before {
+    content: "✔";
+    position: absolute;
+    left: 0;
+    color: #00d4ff;
+    font-weight: bold;
+}
+.cta-button {
+    display: inline-block;
+    background: linear-gradient(90deg, #007bff, #00d4ff);
+    color: white !important;
+    padding: 10px 18px;
+    border-radius: 12px;
+    text-decoration: none;
+    font-weight: 600;
+    transition: transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out;
+    font-size: 0.95rem;
+}
+.cta-button:hover {
+    transform: scale(1.05);
+    box-shadow: 0px 4px 12px rgba(0,0,0,0.3);
+}
 </style>
 """
 
+_CARD_TPL = Template("<div class='card'><h4>$title</h4>$kpi<div class='small'>$desc</div>$bullets$cta</div>")
+_KPI_TPL = Template("<div class='kpi'>$kpi</div>")
+_LIST_TPL = Template("<ul class='feature-list'>$items</ul>")
+_LI_TPL = Template("<li>$b</li>")
+_CTA_TPL = Template("<a href='$href' class='cta-button'>$label</a>")
+
 
 def render_card(
     title: str,
@@ -70,93 +330,116 @@ def render_card(
     bullets: List[str] = None,
     kpi: str = None,
     cta_label: str = None,
+    cta_href: str = "#",
     key: str = None
-):
-    card_css = """
-    <style>
-    .card {
-        background: #1E1E1E;
-        border-radius: 16px;
-        padding: 20px;
-        margin-bottom: 20px;
-        box-shadow: 0px 2px 10px rgba(0,0,0,0.3);
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-    }
-    .card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0px 6px 18px rgba(0,0,0,0.45);
-    }
-    .card h4 {
-        margin: 0 0 10px 0;
-        font-size: 1.3rem;
-        font-weight: 600;
-        color: #ffffff;
-    }
-    .kpi {
-        font-size: 1.1rem;
-        font-weight: bold;
-        color: #00d4ff;
-        margin-bottom: 10px;
-    }
-    .small {
-        font-size: 0.95rem;
-        color: #d0d0d0;
-        margin-bottom: 10px;
-        line-height: 1.5;
-    }
-    .feature-list {
-        list-style: none;
-        padding-left: 0;
-        margin-bottom: 15px;
-    }
-    .feature-list li {
-        position: relative;
-        padding-left: 25px;
-        margin-bottom: 8px;
-        color: #ededed;
-        font-size: 0.95rem;
-    }
-    .feature-list li::before {
-        content: "✔";
-        position: absolute;
-        left: 0;
-        color: #00d4ff;
-        font-weight: bold;
-    }
-    .cta-button {
-        display: inline-block;
-        background: linear-gradient(90deg, #007bff, #00d4ff);
-        color: white !important;
-        padding: 10px 18px;
-        border-radius: 12px;
-        text-decoration: none;
-        font-weight: 600;
-        transition: transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out;
-        font-size: 0.95rem;
-    }
-    .cta-button:hover {
-        transform: scale(1.05);
-        box-shadow: 0px 4px 12px rgba(0,0,0,0.3);
-    }
-    </style>
-    """
-
-    html = f"<div class='card'>"
-    html += f"<h4>{title}</h4>"
-    if kpi:
-        html += f"<div class='kpi'>{kpi}</div>"
-    html += f"<div class='small'>{desc}</div>"
-    if bullets:
-        html += "<ul class='feature-list'>"
-        for b in bullets:
-            html += f"<li>{b}</li>"
-        html += "</ul>"
-    if cta_label:
-        html += f"<a href='#' class='cta-button'>{cta_label}</a>"
-    html += "</div>"
-
-    st.markdown(card_css + html, unsafe_allow_html=True)
+) -> Markup:
+    # Text fields are escaped once; the filled-in templates are tagged as Markup so joins don't re-escape them.
+    items = Markup("").join(Markup(_LI_TPL.substitute(b=escape(b))) for b in bullets or ())
+    return Markup(_CARD_TPL.substitute(
+        title=escape(title),
+        kpi=_KPI_TPL.substitute(kpi=escape(kpi)) if kpi else "",
+        desc=escape(desc),
+        bullets=_LIST_TPL.substitute(items=items) if bullets else "",
+        cta=_CTA_TPL.substitute(href=escape(cta_href), label=escape(cta_label)) if cta_label else "",
+    ))
+
 
+# ----------------------------
+# Home Page Content
+# ----------------------------
+
+PITCH = {
+    "title": "Viatra — Personal Health OS + Doctor Cockpit",
+    "value_prop": "A smart, interoperable health platform that empowers patients with 'doctor-eyes' and gives physicians a unified cockpit. Viatra acts as a predictive, preventive, and personalized health layer on top of existing care journeys.",
+    "vision": "We are redefining healthcare from episodic and reactive to continuous, anticipatory, and data-driven.",
+    "differentiation": [
+        "Consumer module (Viatra): family health hub, personal health OS, AI-driven health interpreter",
+        "Doctor module (DoctorHub): streamlined cockpit with predictive triage, patient insights, and reduced admin overhead",
+        "Enterprise-ready: interoperable with EMR/EHR, designed for scalability and compliance"
+    ],
+    "traction": {
+        "MVP_status": "Functional demo with patient vitals, AI interpreter, and family health profiles",
+        "pipeline": "Exploring hospital pilot collaborations and user beta trials"
+    },
+    "asks": [
+        "Pilot partnership with leading hospitals/clinics",
+        "Seed investment to accelerate development and regulatory compliance",
+        "Integration pilots with existing hospital information systems"
+    ],
+    "metrics": {
+        "engagement_target": "30% weekly active users (WAU) within 6 months",
+        "efficiency_target": "20% reduction in physician admin load",
+        "clinical_target": "Improved early detection of high-risk cases by 15%"
+    },
+    "north_star": "To become the anticipatory health OS — the layer where patients, families, and doctors converge seamlessly."
+}
+
+
+@st.cache_data
+def _home_cards_html() -> Markup:
+    cards = [
+        # Consumer Card
+        render_card(
+            "Consumer Module — Viatra",
+            "A clinician-inspired Personal Health OS for patients and families.",
+            bullets=[
+                "Doctor-style timeline of vitals, labs, meds and wearables",
+                "Universal Locker: OCR → structured records (FHIR-ready)",
+                "AI Health Interpreter: clinician-style, contextual explanations",
+                "Digital Twin & Predictive Risk scoring",
+                "Micro-consults & Personalized Preventive Marketplace"
+            ],
+            kpi="Engagement: pilot KPI — 30% weekly active"
+        ),
+
+        # Doctor Card
+        render_card(
+            "Hospital Module — Viatra",
+            "A one-stop digital cockpit for physicians; designed to integrate with hospital systems.",
+            bullets=[
+                "Secure patient registry & bedside notes (blockchain anchor optional)",
+                "Duty rosters, e-prescription, and interaction checks",
+                "Clinical Decision Support & risk flagging",
+                "Collaboration, analytics and a Learning Hub"
+            ],
+            kpi="Efficiency: reduce admin time by 20% (target)",
+            cta_label="Request Hospital Pilot",
+            cta_href="#pilot"
+        ),
+
+        # Tech Card
+        render_card(
+            "Technology Stack & Security",
+            "API-first microservices, LLM+guardrails for clinical interpretation, and privacy-first engineering.",
+            bullets=[
+                "FHIR/HL7 connectors, wearable SDKs, pharmacy APIs",
+                "Time-series DB, object store for records, OLAP & analytics",
+                "RBAC, encryption, audit logs, optional on-prem installs"
+            ],
+            kpi="Compliance: HIPAA/GDPR patterns included"
+        ),
+
+        # GTM Card
+        render_card(
+            "Go-to-Market & Monetization",
+            "Hybrid revenue model: consumer subscriptions, micro-consults, marketplace commissions, and B2B hospital SaaS.",
+            bullets=[
+                "Phase 1: D2C adoption & micro-consult monetization",
+                "Phase 2: Hospital pilots and enterprise contracts",
+                "Strategic lab/pharmacy/payer partnerships"
+            ],
+            kpi="Revenue mix target: 40% B2B, 40% Marketplace, 20% D2C"
+        ),
+    ]
+    return Markup("<div class='card-grid'>{}</div>").format(Markup("").join(cards))
+
+
+HOME_CTAS = {
+    "Try Consumer Demo": "Viatra (Consumer)",
+    "Try Hospital Demo": "Viatra (Hospital)",
+}
+
+_PITCH_BYTES = orjson.dumps(PITCH, option=orjson.OPT_INDENT_2)
 
 
 # ----------------------------
@@ -164,92 +447,49 @@ def render_card(
 # ----------------------------
 
 st.set_page_config(page_title=APP_TITLE, layout="wide")
-st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+st.markdown(_STYLES, unsafe_allow_html=True)
 
 with st.container():
     st.markdown("<div class='app-header'><div><div class='brand'>Viatra</div><div class='lead'>A smart Personal Health OS + Doctor Cockpit — anticipatory, interoperable, and enterprise-ready.</div></div></div>", unsafe_allow_html=True)
 
+# Home CTAs and deep links navigate via ?page=...; apply it before the radio is created.
+if "page" in st.query_params:
+    nav_target = st.query_params.pop("page")
+    if nav_target in PAGE_NAMES:
+        st.session_state.nav_page = nav_target
+
 with st.sidebar:
     st.markdown("### Navigation")
-    page = st.radio(
-        "Go to",
-        [
-            "Home / About",
-            "Viatra (Consumer)",
-            "Viatra (Hospital)",
-        ],
-    )
+    page = st.radio("Go to", PAGE_NAMES, key="nav_page")
 
 # ----------------------------
 # Home / About Page (Smarter UI)
 # ----------------------------
 
-if page == "Home / About":
+@st.fragment
+def _page_home():
     st.markdown("<div style='display:flex;gap:18px;align-items:center'><div style='flex:1'><h2>Welcome — Viatra</h2><div class='small'>The only platform that gives patients a clinician's view while giving doctors a single, integrated cockpit for care.</div></div><div style='text-align:right'><a class='cta' href='#pilot'>Request a Pilot</a></div></div>", unsafe_allow_html=True)
 
-    st.markdown("<div class='card-grid'>", unsafe_allow_html=True)
-
-    # Consumer Card
-    render_card(
-        "Consumer Module — Viatra",
-        "A clinician-inspired Personal Health OS for patients and families.",
-        bullets=[
-            "Doctor-style timeline of vitals, labs, meds and wearables",
-            "Universal Locker: OCR → structured records (FHIR-ready)",
-            "AI Health Interpreter: clinician-style, contextual explanations",
-            "Digital Twin & Predictive Risk scoring",
-            "Micro-consults & Personalized Preventive Marketplace"
-        ],
-        kpi="Engagement: pilot KPI — 30% weekly active",
-        cta_label="Try Consumer Demo"
-    )
-
-    # Doctor Card
-    render_card(
-        "Hospital Module — Viatra",
-        "A one-stop digital cockpit for physicians; designed to integrate with hospital systems.",
-        bullets=[
-            "Secure patient registry & bedside notes (blockchain anchor optional)",
-            "Duty rosters, e-prescription, and interaction checks",
-            "Clinical Decision Support & risk flagging",
-            "Collaboration, analytics and a Learning Hub"
-        ],
-        kpi="Efficiency: reduce admin time by 20% (target)",
-        cta_label="Request Hospital Pilot"
-    )
-
-    # Tech Card
-    render_card(
-        "Technology Stack & Security",
-        "API-first microservices, LLM+guardrails for clinical interpretation, and privacy-first engineering.",
-        bullets=[
-            "FHIR/HL7 connectors, wearable SDKs, pharmacy APIs",
-            "Time-series DB, object store for records, OLAP & analytics",
-            "RBAC, encryption, audit logs, optional on-prem installs"
-        ],
-        kpi="Compliance: HIPAA/GDPR patterns included",
-        cta_label="See Architecture"
-    )
-
-    # GTM Card
-    render_card(
-        "Go-to-Market & Monetization",
-        "Hybrid revenue model: consumer subscriptions, micro-consults, marketplace commissions, and B2B hospital SaaS.",
-        bullets=[
-            "Phase 1: D2C adoption & micro-consult monetization",
-            "Phase 2: Hospital pilots and enterprise contracts",
-            "Strategic lab/pharmacy/payer partnerships"
-        ],
-        kpi="Revenue mix target: 40% B2B, 40% Marketplace, 20% D2C"
-    )
-
-    st.markdown("</div>", unsafe_allow_html=True)
+    st.markdown(_home_cards_html(), unsafe_allow_html=True)
+
+    # All CTAs share one form. A click reruns this fragment on submit, then st.rerun(scope="app")
+    # reruns the whole app so the sidebar picks up the new page.
+    with st.form("home_ctas", clear_on_submit=False, border=False):
+        target = None
+        for col, (label, dest) in zip(st.columns(len(HOME_CTAS)), HOME_CTAS.items()):
+            with col:
+                if st.form_submit_button(label, type="primary"):
+                    target = dest
+    if target:
+        st.query_params["page"] = target
+        st.rerun(scope="app")
 
     # # Interactive Architecture Diagram
     # st.markdown("---")
     # st.subheader("Runtime Architecture — Interactive (toy diagram)")
     # if st.checkbox("Show architecture diagram"):
     #     # Draw a simple architecture diagram using matplotlib
+    #     import matplotlib.pyplot as plt
     #     fig, ax = plt.subplots(figsize=(9,3))
     #     ax.axis('off')
     #     boxes = ["Wearables & Devices","Consumer App","Ingestion (OCR / FHIR)","AI Interpreter / Twin","Time-series DB / Locker","Viatra / EMR" ]
@@ -273,50 +513,23 @@ if page == "Home / About":
         notes = st.text_area('Notes / Objectives')
         submitted = st.form_submit_button('Request Pilot')
         if submitted:
-            st.session_state.pilot_requests.append({
-                'org': org,
-                'email': email,
-                'use_case': use_case,
-                'notes': notes,
-                'created': datetime.utcnow().isoformat()
-            })
+            _append_log("pilot_requests", PilotRequest(
+                org=org,
+                email=email,
+                use_case=use_case,
+                notes=notes,
+                created_ns=time.time_ns()
+            ))
             st.success('Pilot request sent — our team will reach out within 48 business hours (demo SLA).')
 
     if st.session_state.pilot_requests:
-        st.markdown("**Recent Pilot Requests (demo)**")
-        st.table(pd.DataFrame(st.session_state.pilot_requests).tail(5))
+        with st.expander("Recent Pilot Requests (demo)", expanded=False):
+            st.table(pd.DataFrame([r.row() for r in st.session_state.pilot_requests[-5:]]))
 
     # Downloadable pitch deck (toy)
     st.markdown("---")
     st.subheader("Download — One-page Pitch (PDF/JSON)")
-    pitch = {
-        "title": "Viatra — Personal Health OS + Doctor Cockpit",
-        "value_prop": "A smart, interoperable health platform that empowers patients with 'doctor-eyes' and gives physicians a unified cockpit. Viatra acts as a predictive, preventive, and personalized health layer on top of existing care journeys.",
-        "vision": "We are redefining healthcare from episodic and reactive to continuous, anticipatory, and data-driven.",
-        "differentiation": [
-            "Consumer module (Viatra): family health hub, personal health OS, AI-driven health interpreter",
-            "Doctor module (DoctorHub): streamlined cockpit with predictive triage, patient insights, and reduced admin overhead",
-            "Enterprise-ready: interoperable with EMR/EHR, designed for scalability and compliance"
-        ],
-        "traction": {
-            "MVP_status": "Functional demo with patient vitals, AI interpreter, and family health profiles",
-            "pipeline": "Exploring hospital pilot collaborations and user beta trials"
-        },
-        "asks": [
-            "Pilot partnership with leading hospitals/clinics",
-            "Seed investment to accelerate development and regulatory compliance",
-            "Integration pilots with existing hospital information systems"
-        ],
-        "metrics": {
-            "engagement_target": "30% weekly active users (WAU) within 6 months",
-            "efficiency_target": "20% reduction in physician admin load",
-            "clinical_target": "Improved early detection of high-risk cases by 15%"
-        },
-        "north_star": "To become the anticipatory health OS — the layer where patients, families, and doctors converge seamlessly."
-        }
-
-    pitch_payload = json.dumps(pitch, indent=2)
-    st.download_button('Download Pitch (JSON)', data=pitch_payload, file_name='Viatra_pitch.json')
+    st.download_button('Download Pitch (JSON)', data=_PITCH_BYTES, file_name='Viatra_pitch.json', mime='application/json')
 
     st.markdown("<div class='footer-small'>Questions? Use the sidebar to navigate to the interactive Consumer & Doctor demos. This landing page is a smart, product-led narrative ready for investor and hospital stakeholders.</div>", unsafe_allow_html=True)
 
@@ -324,12 +537,13 @@ if page == "Home / About":
 # Viatra (Consumer)
 # ----------------------------
 
-if page == "Viatra (Consumer)":
+@st.fragment
+def _page_consumer():
     left, right = st.columns([1, 2])
 
     with left:
         st.subheader("Family Hub")
-        prof_names = list(st.session_state.profiles.keys())
+        prof_names = st.session_state.profile_names
         active = st.selectbox("Active profile", prof_names, index=prof_names.index(st.session_state.active_profile))
         if active != st.session_state.active_profile:
             st.session_state.active_profile = active
@@ -337,10 +551,12 @@ if page == "Viatra (Consumer)":
         new_name = st.text_input("Add profile name")
         if st.button("Add Profile") and new_name and new_name not in st.session_state.profiles:
             st.session_state.profiles[new_name] = {"dob": None, "gender": None}
-            st.session_state.vitals[new_name] = pd.DataFrame(columns=["datetime","systolic","diastolic","hr","glucose"]) 
+            st.session_state.profile_names = tuple(st.session_state.profiles)
+            st.session_state.vitals_rows[new_name] = []
             st.session_state.meds[new_name] = []
             st.session_state.records[new_name] = []
-            st.session_state.passport[new_name] = {"immunizations": [], "allergies": [], "conditions": []}
+            st.session_state.passport.setdefault(new_name, {"immunizations": [], "allergies": [], "conditions": []})
+            _persist("passport")
             st.success(f"Profile '{new_name}' added.")
 
         st.divider()
@@ -350,10 +566,11 @@ if page == "Viatra (Consumer)":
         cond = st.text_area("Chronic Conditions (comma-separated)", value=", ".join(st.session_state.passport[st.session_state.active_profile].get("conditions", [])))
         if st.button("Update Passport"):
             st.session_state.passport[st.session_state.active_profile] = {
-                "immunizations": [x.strip() for x in imms.split(",") if x.strip()],
-                "allergies": [x.strip() for x in alls.split(",") if x.strip()],
-                "conditions": [x.strip() for x in cond.split(",") if x.strip()],
+                "immunizations": _csv(imms),
+                "allergies": _csv(alls),
+                "conditions": _csv(cond),
             }
+            _persist("passport")
             st.success("Passport updated.")
         passport_payload = json.dumps({
             "profile": st.session_state.active_profile,
@@ -365,7 +582,7 @@ if page == "Viatra (Consumer)":
         st.subheader("Medication Companion")
         meds_str = st.text_input("Current meds (comma-separated)", value=", ".join(st.session_state.meds[st.session_state.active_profile]))
         if st.button("Save Med List"):
-            st.session_state.meds[st.session_state.active_profile] = [m.strip() for m in meds_str.split(",") if m.strip()]
+            st.session_state.meds[st.session_state.active_profile] = _csv(meds_str)
             st.success("Medication list saved.")
 
     with right:
@@ -384,18 +601,16 @@ if page == "Viatra (Consumer)":
             with col5:
                 glu = st.number_input("Glucose (mg/dL)", 60, 400, 95)
             if st.button("Add Entry"):
-                df = st.session_state.vitals[st.session_state.active_profile]
-                st.session_state.vitals[st.session_state.active_profile] = pd.concat([
-                    df,
-                    pd.DataFrame([{"date":date, "time":time, "systolic": sys, "diastolic": dia, "hr": hr, "glucose": glu}])
-                ], ignore_index=True)
+                st.session_state.vitals_rows[st.session_state.active_profile].append(
+                    {"datetime": datetime.combine(date, time), "systolic": sys, "diastolic": dia, "hr": hr, "glucose": glu}
+                )
                 st.success("Entry added.")
 
-        vitals_df = st.session_state.vitals[st.session_state.active_profile]
-        if vitals_df.empty:
+        vitals_rows = st.session_state.vitals_rows[st.session_state.active_profile]
+        if not vitals_rows:
             st.info("No vitals yet — use the Log Vitals form to add data.")
         else:
-            st.table(vitals_df.tail(6))
+            st.table(_frame(f"vitals:{st.session_state.active_profile}", vitals_rows, VITALS_COLUMNS, VITALS_DTYPES).tail(6))
 
         st.divider()
         st.subheader("AI Health Interpreter (Demo)")
@@ -410,86 +625,117 @@ if page == "Viatra (Consumer)":
 # Viatra (Hospital)
 # ----------------------------
 
-if page == "Viatra (Hospital)":
+@st.cache_data
+def _synthetic_appts(today: date) -> pd.Series:
+    dates = pd.date_range(today - timedelta(days=29), periods=30)
+    i = np.arange(30, dtype=np.int32)
+    return pd.Series(np.maximum(5, 20 + i % 7 - i // 5), index=dates)
+
+
+# Patient Management
+@st.fragment
+def _hosp_patients():
+    st.subheader("Patient Registry")
+    c1, c2, c3, c4, c5, c6 = st.columns(6)
+    with c1:
+        pid = st.text_input("ID")
+    with c2:
+        pname = st.text_input("Name")
+    with c3:
+        page = st.number_input("Age", 0, 120, 40)
+    with c4:
+        psex = st.selectbox("Sex", ["M","F","Other"])
+    with c5:
+        pall = st.text_input("Allergies")
+    with c6:
+        pcom = st.text_input("Comorbidities")
+    if st.button("Add / Update Patient"):
+        rows = [r for r in st.session_state.patient_rows if r["id"] != pid]
+        rows.append({"id": pid, "name": pname, "age": page, "sex": psex, "allergies": pall, "comorbidities": pcom})
+        st.session_state.patient_rows = rows
+        st.session_state.patient_edits += 1
+        st.success("Patient upserted.")
+    patients_df = _frame("patients", st.session_state.patient_rows, PATIENT_COLUMNS, version=st.session_state.patient_edits)
+    st.dataframe(patients_df, key="patients_grid")
+
+
+# Scheduling & Duty
+@st.fragment
+def _hosp_scheduling():
+    st.subheader("Rosters & Shifts")
+    rdate = st.date_input("Date", value=date.today())
+    rshift = st.selectbox("Shift", ["Morning","Evening","Night"]) 
+    rdoc = st.text_input("Doctor")
+    if st.button("Add to Roster"):
+        st.session_state.roster_rows.append(RosterEntry(date=rdate.isoformat(), shift=rshift, doctor=rdoc))
+        st.success("Roster entry added.")
+    st.dataframe(_frame("roster", st.session_state.roster_rows, ROSTER_COLUMNS, sort_by=["date","shift"]))
+
+
+# Prescription & Medication Management
+@st.fragment
+def _hosp_rx():
+    st.subheader("E-Prescription")
+    rx_name = st.text_input("Patient Name")
+    rx_drugs = st.text_area("Medications (comma-separated)")
+    rx_notes = st.text_area("Instructions")
+    if st.button("Generate Rx"):
+        meds = _csv(rx_drugs)
+        st.json({"patient": rx_name, "meds": meds, "instructions": rx_notes})
+        st.success("E-prescription generated (demo).")
+
+
+# Collaboration & Analytics (simplified)
+@st.fragment
+def _hosp_collaboration():
+    st.subheader("Secure Chat (Demo)")
+    msg = st.text_input("Message")
+    if st.button("Send") and msg:
+        _append_log("chat", ChatMessage(ts_ns=time.time_ns(), who="Dr. Demo", msg=msg))
+    if st.session_state.chat:
+        st.table(_frame("chat", st.session_state.chat, to_row=ChatMessage.row))
+
+
+@st.fragment
+def _hosp_analytics():
+    st.subheader("Operational Analytics (Demo)")
+    st.caption("Daily Appointments (synthetic)")
+    st.line_chart(_synthetic_appts(date.today()), x_label="Date", y_label="Count")
+
+
+# Decision Support and Learning & Research have no demo content yet, so they render nothing.
+HOSPITAL_VIEWS = {
+    "Patient Management": _hosp_patients,
+    "Scheduling & Duty": _hosp_scheduling,
+    "Rx & Meds": _hosp_rx,
+    "Decision Support": None,
+    "Collaboration": _hosp_collaboration,
+    "Analytics": _hosp_analytics,
+    "Learning & Research": None,
+}
+
+
+@st.fragment
+def _page_hospital():
     st.markdown("**Operating Model:** Centralized cockpit for patient management, scheduling, e-prescriptions, decision support, collaboration, analytics, and learning — designed to integrate with existing HIS/EMR via FHIR/HL7.")
 
-    tabs = st.tabs([
-        "Patient Management",
-        "Scheduling & Duty",
-        "Rx & Meds",
-        "Decision Support",
-        "Collaboration",
-        "Analytics",
-        "Learning & Research",
-    ])
-
-    # Patient Management
-    with tabs[0]:
-        st.subheader("Patient Registry")
-        c1, c2, c3, c4, c5, c6 = st.columns(6)
-        with c1:
-            pid = st.text_input("ID")
-        with c2:
-            pname = st.text_input("Name")
-        with c3:
-            page = st.number_input("Age", 0, 120, 40)
-        with c4:
-            psex = st.selectbox("Sex", ["M","F","Other"])
-        with c5:
-            pall = st.text_input("Allergies")
-        with c6:
-            pcom = st.text_input("Comorbidities")
-        if st.button("Add / Update Patient"):
-            df = st.session_state.patients
-            df = df[df["id"] != pid]
-            st.session_state.patients = pd.concat([df, pd.DataFrame([{"id": pid, "name": pname, "age": page, "sex": psex, "allergies": pall, "comorbidities": pcom}])], ignore_index=True)
-            st.success("Patient upserted.")
-        st.dataframe(st.session_state.patients)
-
-    # Scheduling & Duty
-    with tabs[1]:
-        st.subheader("Rosters & Shifts")
-        rdate = st.date_input("Date", value=date.today())
-        rshift = st.selectbox("Shift", ["Morning","Evening","Night"]) 
-        rdoc = st.text_input("Doctor")
-        if st.button("Add to Roster"):
-            st.session_state.roster = pd.concat([
-                st.session_state.roster,
-                pd.DataFrame([{"date": rdate.isoformat(), "shift": rshift, "doctor": rdoc}])
-            ], ignore_index=True)
-            st.success("Roster entry added.")
-        st.dataframe(st.session_state.roster.sort_values(by=["date","shift"]))
-
-    # Prescription & Medication Management
-    with tabs[2]:
-        st.subheader("E-Prescription")
-        rx_name = st.text_input("Patient Name")
-        rx_drugs = st.text_area("Medications (comma-separated)")
-        rx_notes = st.text_area("Instructions")
-        if st.button("Generate Rx"):
-            meds = [m.strip() for m in rx_drugs.split(",") if m.strip()]
-            st.json({"patient": rx_name, "meds": meds, "instructions": rx_notes})
-            st.success("E-prescription generated (demo).")
-
-    # Collaboration & Analytics (simplified)
-    with tabs[4]:
-        st.subheader("Secure Chat (Demo)")
-        msg = st.text_input("Message")
-        if st.button("Send") and msg:
-            st.session_state.chat.append({"when": datetime.utcnow().isoformat(), "who": "Dr. Demo", "msg": msg})
-        if st.session_state.chat:
-            st.table(pd.DataFrame(st.session_state.chat))
-
-    with tabs[5]:
-        st.subheader("Operational Analytics (Demo)")
-        dates = pd.date_range(date.today() - timedelta(days=29), periods=30)
-        appts = pd.Series([max(5, int(20 + i % 7 - (i//5))) for i in range(30)], index=dates)
-        fig1, ax1 = plt.subplots()
-        ax1.plot(appts.index, appts.values)
-        ax1.set_title("Daily Appointments (synthetic)")
-        ax1.set_xlabel("Date")
-        ax1.set_ylabel("Count")
-        st.pyplot(fig1)
+    # Only the selected view's body runs; st.tabs would execute every tab on each rerun.
+    # A single-select segmented control can be deselected; fall back to the first view so one always shows, as with st.tabs.
+    view = st.segmented_control("View", list(HOSPITAL_VIEWS), default="Patient Management", key="hosp_tab", label_visibility="collapsed") or "Patient Management"
+    render = HOSPITAL_VIEWS.get(view)
+    if render:
+        render()
+
+# ----------------------------
+# Page Dispatch
+# ----------------------------
+
+PAGES = {
+    "Home / About": _page_home,
+    "Viatra (Consumer)": _page_consumer,
+    "Viatra (Hospital)": _page_hospital,
+}
+PAGES[page]()
 
 # ----------------------------
 # Footer